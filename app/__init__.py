@@ -1,22 +1,54 @@
-from flask import Flask
-from flask_cors import CORS
+import importlib
+import logging
+from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import insert
+from app.seed_data import SEED_USERS
 
 db = SQLAlchemy()
 
+logger = logging.getLogger(__name__)
 
-def create_app():
+
+def seed_database():
+    """Seed the database with test users if it is empty"""
+    from app.models.user import User
+    
+    # Probe for a single row instead of counting the whole table
+    if db.session.query(User.user_id).limit(1).first() is not None:
+        return
+    
+    hashes = User.hash_passwords([u.password for u in SEED_USERS],
+                                 rounds=current_app.config['PASSWORD_HASH_ROUNDS'])
+    
+    rows = [u.to_row(password_hash) for u, password_hash in zip(SEED_USERS, hashes)]
+    # Core executemany INSERT: no ORM objects, no flush, one commit
+    db.session.execute(insert(User), rows)
+    db.session.commit()
+    
+    logger.info('Seeded database with %d users', len(rows))
+
+
+def create_app(auto_seed=None):
+    """Create the application; auto_seed overrides the AUTO_SEED setting"""
     app = Flask(__name__)
     
     # Load configuration
     app.config.from_object('app.config.Config')
     
+    # Serialize JSON with orjson
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+    
     # Initialize extensions
+    from flask_cors import CORS
     db.init_app(app)
     CORS(app, resources={r"/*": {"origins": "*"}})
     
-    # Import and register blueprints
+    # Import route modules (which attach their views) and register blueprints
     from app.routes import user_bp, internal_bp
+    importlib.import_module('app.routes.user_routes')
+    importlib.import_module('app.routes.internal_routes')
     app.register_blueprint(user_bp, url_prefix='/users')
     app.register_blueprint(internal_bp, url_prefix='/internal')
     
@@ -24,9 +56,11 @@ def create_app():
     from app.utils.error_handlers import register_error_handlers
     register_error_handlers(app)
     
-    # Create tables
+    # Create tables and seed test users on first start
     with app.app_context():
         db.create_all()
+        if app.config['AUTO_SEED'] if auto_seed is None else auto_seed:
+            seed_database()
     
     # Health check endpoint
     @app.route('/health')
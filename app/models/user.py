@@ -1,23 +1,56 @@
+import hashlib
+import operator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import bcrypt
 from app import db
 
+# User types with admin privileges
+ADMIN_TYPES = frozenset({'admin', 'super_admin'})
+
+# Serialized attributes in output order, and their public (camelCase) keys
+_FIELDS = (
+    'user_id', 'first_name', 'last_name', 'email', 'pending_email',
+    'active', 'email_verified', 'date_joined', 'type', 'profile_image_url'
+)
+_PUBLIC_KEYS = (
+    'userId', 'firstName', 'lastName', 'email', 'pendingEmail',
+    'active', 'emailVerified', 'dateJoined', 'type', 'profileImageUrl'
+)
+_DATE_JOINED = _FIELDS.index('date_joined')
+_get_fields = operator.attrgetter(*_FIELDS)
+
+
+def _field_values(obj):
+    """Serialized values of _FIELDS from a User or a column row of the same names"""
+    values = list(_get_fields(obj))
+    # Tables created before date_joined became NOT NULL may still hold NULLs
+    if values[_DATE_JOINED] is not None:
+        values[_DATE_JOINED] = values[_DATE_JOINED].isoformat()
+    return values
+
 
 class User(db.Model):
     """User model"""
     
     __tablename__ = 'users'
+    __table_args__ = (
+        # Keyset pagination order for the admin user list
+        db.Index('ix_users_date_joined_user_id', 'date_joined', 'user_id'),
+    )
     
     user_id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     first_name = db.Column(db.String(50), nullable=False)
     last_name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(100), unique=True, nullable=False, index=True)
-    pending_email = db.Column(db.String(100), nullable=True)
+    pending_email = db.Column(db.String(100), nullable=True, index=True)
     password = db.Column(db.String(255), nullable=False)
     active = db.Column(db.Boolean, default=True)
     email_verified = db.Column(db.Boolean, default=False)
     verification_token = db.Column(db.String(255), nullable=True)
     token_expires_at = db.Column(db.DateTime, nullable=True)
-    date_joined = db.Column(db.DateTime, default=datetime.utcnow)
+    date_joined = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                            server_default=db.func.now())
     type = db.Column(
         db.Enum('visitor', 'unverified', 'normal', 'admin', 'super_admin'),
         default='unverified'
@@ -27,20 +60,20 @@ class User(db.Model):
     def __repr__(self):
         return f'<User {self.email}>'
     
+    @staticmethod
+    def hash_password(password: str, rounds: int = 12) -> str:
+        """Hash a plain-text password with bcrypt at the given cost"""
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+    
+    @staticmethod
+    def hash_passwords(passwords, rounds: int = 12) -> list:
+        """Hash several passwords in parallel (bcrypt releases the GIL)"""
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(User.hash_password, passwords, [rounds] * len(passwords)))
+    
     def to_dict(self, include_password=False):
         """Convert user to dictionary"""
-        data = {
-            'user_id': self.user_id,
-            'first_name': self.first_name,
-            'last_name': self.last_name,
-            'email': self.email,
-            'pending_email': self.pending_email,
-            'active': self.active,
-            'email_verified': self.email_verified,
-            'date_joined': self.date_joined.isoformat() if self.date_joined else None,
-            'type': self.type,
-            'profile_image_url': self.profile_image_url
-        }
+        data = dict(zip(_FIELDS, _field_values(self)))
         
         if include_password:
             data['password'] = self.password
@@ -49,15 +82,15 @@ class User(db.Model):
     
     def to_public_dict(self):
         """Convert user to public dictionary (safe to expose)"""
-        return {
-            'userId': self.user_id,
-            'firstName': self.first_name,
-            'lastName': self.last_name,
-            'email': self.email,
-            'pendingEmail': self.pending_email,
-            'active': self.active,
-            'emailVerified': self.email_verified,
-            'dateJoined': self.date_joined.isoformat() if self.date_joined else None,
-            'type': self.type,
-            'profileImageUrl': self.profile_image_url
-        }
+        return dict(zip(_PUBLIC_KEYS, _field_values(self)))
+    
+    @staticmethod
+    def rows_to_public_dicts(rows):
+        """Convert column rows (selected by column name) to public dictionaries
+        without building User objects"""
+        return [dict(zip(_PUBLIC_KEYS, _field_values(row))) for row in rows]
+    
+    def etag(self):
+        """Short hash of the public fields, used to answer conditional GETs"""
+        fields = repr(_field_values(self))
+        return hashlib.blake2b(fields.encode(), digest_size=8).hexdigest()
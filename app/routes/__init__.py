@@ -3,5 +3,5 @@ from flask import Blueprint
 user_bp = Blueprint('users', __name__)
 internal_bp = Blueprint('internal', __name__)
 
-from app.routes.user_routes import *
-from app.routes.internal_routes import *
+# Route modules are imported by create_app() when the blueprints are
+# registered, so importing this package only builds the blueprints.
@@ -1,14 +1,56 @@
 from flask import request, jsonify
 from datetime import datetime
+import hmac
+from werkzeug.exceptions import HTTPException
 from app.routes import internal_bp
 from app.services.user_service import UserService
-from app.utils.decorators import handle_exceptions
+from app.utils.error_handlers import AppError, handle_app_error
+from app.utils.responses import error_response
+import logging
+
+logger = logging.getLogger(__name__)
 
 user_service = UserService()
 
+# Upper bound on IDs accepted by one batch lookup
+MAX_BATCH_IDS = 100
+
+
+# Blueprint-wide error handling (same responses as @handle_exceptions)
+@internal_bp.errorhandler(ValueError)
+def handle_validation_error(e):
+    logger.warning('Validation error in %s: %s', request.endpoint, e)
+    return jsonify({'error': 'Validation error', 'message': str(e)}), 400
+
+
+@internal_bp.errorhandler(PermissionError)
+def handle_permission_error(e):
+    logger.warning('Permission denied in %s: %s', request.endpoint, e)
+    return jsonify({'error': 'Access denied', 'message': str(e)}), 403
+
+
+# Registered here as well, since the catch-all handler below would
+# otherwise take precedence over the app-level AppError handler
+internal_bp.register_error_handler(AppError, handle_app_error)
+
+
+@internal_bp.errorhandler(Exception)
+def handle_unexpected_error(e):
+    # Leave HTTP errors (bad JSON, 405, ...) to their normal responses
+    if isinstance(e, HTTPException):
+        return e
+    logger.error('Error in %s: %s', request.endpoint, e, exc_info=True)
+    return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
+
+
+def _token_matches(expected, provided):
+    """Compare verification tokens in constant time; a missing token never matches"""
+    if not expected or not isinstance(provided, str):
+        return False
+    return hmac.compare_digest(expected.encode(), provided.encode())
+
 
 @internal_bp.route('/users', methods=['POST'])
-@handle_exceptions
 def create_user():
     """Create a new user (Internal API for Auth Service)"""
     data = request.get_json()
@@ -25,44 +67,56 @@ def create_user():
     return jsonify(user.to_dict(include_password=False)), 201
 
 
+@internal_bp.route('/users', methods=['GET'])
+def get_users_batch():
+    """Get several users by ID in one query, e.g. ?ids=1,2,3 (Internal API)"""
+    try:
+        user_ids = {int(i) for i in request.args.get('ids', '').split(',') if i}
+    except ValueError:
+        return error_response('ids must be a comma-separated list of integers', 400)
+    
+    if len(user_ids) > MAX_BATCH_IDS:
+        return error_response(f'At most {MAX_BATCH_IDS} ids per request', 400)
+    
+    users = user_service.get_users_by_ids(user_ids)
+    
+    return jsonify({'users': [u.to_dict() for u in users]}), 200
+
+
 @internal_bp.route('/users/<int:user_id>', methods=['GET'])
-@handle_exceptions
 def get_user_internal(user_id):
     """Get user by ID (Internal API)"""
     user = user_service.get_user_by_id(user_id)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify(user.to_dict(include_password=True)), 200
 
 
 @internal_bp.route('/users/email/<email>', methods=['GET'])
-@handle_exceptions
 def get_user_by_email(email):
     """Get user by email (Internal API for Auth Service)"""
     user = user_service.get_user_by_email(email)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify(user.to_dict(include_password=True)), 200
 
 
 @internal_bp.route('/users/pending-email/<email>', methods=['GET'])
-@handle_exceptions
 def get_user_by_pending_email(email):
     """Get user by pending email (Internal API for Auth Service)"""
     user = user_service.get_user_by_pending_email(email)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify(user.to_dict(include_password=True)), 200
 
 
 @internal_bp.route('/users/verify-email', methods=['POST'])
-@handle_exceptions
 def verify_email():
     """Verify user email with token (Internal API)"""
     data = request.get_json()
@@ -83,7 +137,7 @@ def verify_email():
     if user.email_verified and not user.pending_email:
         return jsonify({'success': True, 'message': 'Email already verified', 'user': user.to_public_dict()}), 200
     
-    if user.verification_token != token:
+    if not _token_matches(user.verification_token, token):
         return jsonify({'success': False, 'message': 'Invalid verification token'}), 400
     
     if user.token_expires_at and user.token_expires_at < datetime.utcnow():
@@ -100,7 +154,6 @@ def verify_email():
 
 
 @internal_bp.route('/users/<int:user_id>/verification-token', methods=['PUT'])
-@handle_exceptions
 def update_verification_token(user_id):
     """Update user's verification token (Internal API)"""
     data = request.get_json()
@@ -110,13 +163,12 @@ def update_verification_token(user_id):
     user = user_service.update_verification_token(user_id, token, expires_at)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify({'message': 'Verification token updated'}), 200
 
 
 @internal_bp.route('/users/<int:user_id>/verification-token/valid', methods=['GET'])
-@handle_exceptions
 def get_valid_verification_token(user_id):
     """Get valid verification token if exists and not expired (Internal API)"""
     token, expires_at = user_service.get_valid_verification_token(user_id)
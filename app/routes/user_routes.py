@@ -1,7 +1,9 @@
-from flask import request, jsonify
+from flask import request, jsonify, make_response, g
+from app.models.user import ADMIN_TYPES
 from app.routes import user_bp
-from app.services.user_service import UserService
+from app.services.user_service import UserService, PROFILE_FIELDS
 from app.utils.decorators import handle_exceptions, require_auth, require_admin, require_super_admin
+from app.utils.responses import error_response
 
 user_service = UserService()
 
@@ -12,13 +14,26 @@ user_service = UserService()
 @require_admin
 def get_all_users():
     """Get all users (Admin only)"""
-    page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    if per_page < 1:
+        per_page = 20
+    
+    # Keyset pagination: ?after=<cursor> (empty for the first page)
+    if 'after' in request.args:
+        users, next_cursor = user_service.get_users_after(request.args['after'], per_page)
+        
+        return jsonify({
+            'users': users,
+            'perPage': per_page,
+            'nextCursor': next_cursor
+        }), 200
+    
+    page = request.args.get('page', 1, type=int)
     
     users, total = user_service.get_all_users(page, per_page)
     
     return jsonify({
-        'users': [u.to_public_dict() for u in users],
+        'users': users,
         'total': total,
         'page': page,
         'perPage': per_page,
@@ -31,12 +46,20 @@ def get_all_users():
 @require_auth
 def get_user(user_id):
     """Get user by ID"""
-    user = user_service.get_user_by_id(user_id)
+    user = user_service.get_public_user_by_id(user_id)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
+    
+    # Let clients revalidate with If-None-Match instead of refetching the body
+    etag = user.etag()
+    if request.if_none_match.contains(etag):
+        response = make_response('', 304)
+    else:
+        response = jsonify({'user': user.to_public_dict()})
+    response.set_etag(etag)
     
-    return jsonify({'user': user.to_public_dict()}), 200
+    return response
 
 
 @user_bp.route('/<int:user_id>', methods=['PUT'])
@@ -44,21 +67,17 @@ def get_user(user_id):
 @require_auth
 def update_user(user_id):
     """Update user profile"""
-    current_user_id = request.headers.get('X-User-Id')
-    current_user_type = request.headers.get('X-User-Type')
-    
     # Users can only update their own profile (unless admin)
-    if str(current_user_id) != str(user_id) and current_user_type not in ['admin', 'super_admin']:
-        return jsonify({'error': 'Access denied'}), 403
+    if g.current_user_id != str(user_id) and not g.is_admin:
+        return error_response('Access denied', 403)
     
     data = request.get_json()
     
-    # Validate allowed fields
-    allowed_fields = ['firstName', 'lastName', 'email']
-    update_data = {k: v for k, v in data.items() if k in allowed_fields}
+    # Keep only updatable fields
+    update_data = {k: v for k, v in data.items() if k in PROFILE_FIELDS}
     
     if not update_data:
-        return jsonify({'error': 'No valid fields to update'}), 400
+        return error_response('No valid fields to update', 400)
     
     try:
         user, email_changed = user_service.update_user(user_id, update_data)
@@ -66,7 +85,7 @@ def update_user(user_id):
         return jsonify({'error': str(e)}), 400
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     response_data = {
         'message': 'User updated successfully',
@@ -82,21 +101,19 @@ def update_user(user_id):
 @require_auth
 def update_profile_image(user_id):
     """Update user profile image"""
-    current_user_id = request.headers.get('X-User-Id')
-    
-    if str(current_user_id) != str(user_id):
-        return jsonify({'error': 'Access denied'}), 403
+    if g.current_user_id != str(user_id):
+        return error_response('Access denied', 403)
     
     data = request.get_json()
     image_url = data.get('profileImageUrl')
     
     if not image_url:
-        return jsonify({'error': 'Profile image URL is required'}), 400
+        return error_response('Profile image URL is required', 400)
     
     user = user_service.update_profile_image(user_id, image_url)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify({
         'message': 'Profile image updated successfully',
@@ -110,18 +127,16 @@ def update_profile_image(user_id):
 @require_admin
 def ban_user(user_id):
     """Ban a user (Admin only)"""
-    current_user_type = request.headers.get('X-User-Type')
-    
     # Get the target user
     target_user = user_service.get_user_by_id(user_id)
     if not target_user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     # Admins cannot ban other admins
-    if target_user.type in ['admin', 'super_admin']:
-        return jsonify({'error': 'Cannot ban admin users'}), 403
+    if target_user.type in ADMIN_TYPES:
+        return error_response('Cannot ban admin users', 403)
     
-    user = user_service.ban_user(user_id)
+    user = user_service.ban_user(user_id, target_user)
     
     return jsonify({
         'message': 'User banned successfully',
@@ -138,7 +153,7 @@ def unban_user(user_id):
     user = user_service.unban_user(user_id)
     
     if not user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     return jsonify({
         'message': 'User unbanned successfully',
@@ -155,12 +170,12 @@ def promote_user(user_id):
     target_user = user_service.get_user_by_id(user_id)
     
     if not target_user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
-    if target_user.type in ['admin', 'super_admin']:
-        return jsonify({'error': 'User is already an admin'}), 400
+    if target_user.type in ADMIN_TYPES:
+        return error_response('User is already an admin', 400)
     
-    user = user_service.promote_to_admin(user_id)
+    user = user_service.promote_to_admin(user_id, target_user)
     
     return jsonify({
         'message': 'User promoted to admin successfully',
@@ -177,15 +192,15 @@ def demote_user(user_id):
     target_user = user_service.get_user_by_id(user_id)
     
     if not target_user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     if target_user.type == 'super_admin':
-        return jsonify({'error': 'Cannot demote super admin'}), 403
+        return error_response('Cannot demote super admin', 403)
     
     if target_user.type != 'admin':
-        return jsonify({'error': 'User is not an admin'}), 400
+        return error_response('User is not an admin', 400)
     
-    user = user_service.demote_from_admin(user_id)
+    user = user_service.demote_from_admin(user_id, target_user)
     
     return jsonify({
         'message': 'User demoted to normal user successfully',
@@ -202,12 +217,12 @@ def delete_user(user_id):
     target_user = user_service.get_user_by_id(user_id)
     
     if not target_user:
-        return jsonify({'error': 'User not found'}), 404
+        return error_response('User not found', 404)
     
     try:
-        success = user_service.delete_user(user_id)
+        success = user_service.delete_user(user_id, target_user)
         if not success:
-            return jsonify({'error': 'Failed to delete user'}), 500
+            return error_response('Failed to delete user', 500)
         
         return jsonify({
             'message': 'User deleted successfully'
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class SeedUser:
+    """One seed user; field names match the User model attributes"""
+    first_name: str
+    last_name: str
+    email: str
+    password: str
+    type: str
+    email_verified: bool = True
+    active: bool = True
+
+    def to_row(self, password_hash):
+        """Insert parameters for this user, with the password already hashed"""
+        return {
+            'first_name': self.first_name, 'last_name': self.last_name, 'email': self.email,
+            'password': password_hash, 'type': self.type,
+            'email_verified': self.email_verified, 'active': self.active,
+        }
+
+
+# Test users created on first start when the database is empty
+# (seed.py adds a few more on top of these)
+SEED_USERS = (
+    SeedUser('Super', 'Admin', 'superadmin@forum.com', 'SuperAdmin123!', 'super_admin'),
+    SeedUser('Admin', 'User', 'admin@forum.com', 'AdminUser123!', 'admin'),
+    SeedUser('John', 'Doe', 'john.doe@example.com', 'Password123!', 'normal'),
+    SeedUser('Jane', 'Smith', 'jane.smith@example.com', 'Password123!', 'normal'),
+)
@@ -1,21 +1,106 @@
+import re
 from datetime import datetime
+from sqlalchemy import or_, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from app import db
-from app.models.user import User
+from app.models.user import User, ADMIN_TYPES
+from app.utils.error_handlers import ConflictError
+
+# Profile fields accepted by update_user: request key -> (model attribute, max length)
+PROFILE_FIELDS = {
+    'firstName': ('first_name', 50),
+    'lastName': ('last_name', 50),
+    'email': ('email', 100),
+}
+
+# Syntax-only email check; deliverability is proven by the verification email
+EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+
+# Columns read by User.to_public_dict(); read-only endpoints load just these
+# and skip the password hash and verification token
+PUBLIC_COLUMNS = (
+    User.user_id, User.first_name, User.last_name, User.email, User.pending_email,
+    User.active, User.email_verified, User.date_joined, User.type, User.profile_image_url
+)
 
 
 class UserService:
     """Service for user operations"""
     
     def get_all_users(self, page: int = 1, per_page: int = 20):
-        """Get all users with pagination"""
-        pagination = User.query.order_by(User.date_joined.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
-        return pagination.items, pagination.total
+        """Get all users with pagination
+        Reads plain column rows for the list view and skips building User objects.
+        Returns: (public user dicts, total) tuple
+        """
+        page = max(page, 1)
+        if per_page < 1:
+            per_page = 20
+        
+        # COUNT(*) OVER () carries the total on every row of the page, so the
+        # page and the count come back in one query
+        rows = db.session.execute(
+            db.select(*PUBLIC_COLUMNS, db.func.count().over().label('total'))
+            .order_by(User.date_joined.desc(), User.user_id.desc())
+            .limit(per_page).offset((page - 1) * per_page)
+        ).all()
+        
+        if rows:
+            total = rows[0].total
+        else:
+            # Past the last page no row carries the total
+            total = db.session.execute(db.select(db.func.count(User.user_id))).scalar()
+        
+        return User.rows_to_public_dicts(rows), total
+    
+    def get_users_after(self, cursor: str = None, per_page: int = 20) -> tuple:
+        """Get the next page of users after a keyset cursor ("<date_joined>,<user_id>")
+        Seeks on (date_joined, user_id) so deep pages cost the same as the first,
+        and skips the COUNT(*) that offset pagination needs.
+        Returns: (public user dicts, next_cursor) tuple, next_cursor is None on the last page
+        """
+        if per_page < 1:
+            per_page = 20
+        
+        query = db.select(*PUBLIC_COLUMNS)
+        
+        if cursor:
+            date_joined, _, user_id = cursor.rpartition(',')
+            try:
+                position = (datetime.fromisoformat(date_joined), int(user_id))
+            except ValueError:
+                raise ValueError('Invalid pagination cursor')
+            query = query.where(tuple_(User.date_joined, User.user_id) < position)
+        
+        # Fetch one extra row to know whether another page follows
+        rows = db.session.execute(
+            query.order_by(User.date_joined.desc(), User.user_id.desc()).limit(per_page + 1)
+        ).all()
+        
+        if len(rows) <= per_page:
+            return (User.rows_to_public_dicts(rows), None)
+        
+        rows = rows[:per_page]
+        last = rows[-1]
+        return (User.rows_to_public_dicts(rows), f'{last.date_joined.isoformat()},{last.user_id}')
     
     def get_user_by_id(self, user_id: int) -> User:
         """Get user by ID"""
-        return User.query.get(user_id)
+        return db.session.get(User, user_id)
+    
+    def get_public_user_by_id(self, user_id: int) -> User:
+        """Get user by ID with only the public columns loaded"""
+        return db.session.execute(
+            db.select(User).options(load_only(*PUBLIC_COLUMNS)).filter_by(user_id=user_id)
+        ).scalar_one_or_none()
+    
+    def get_users_by_ids(self, user_ids) -> list:
+        """Get several users by ID in one IN (...) query, public columns only"""
+        if not user_ids:
+            return []
+        return User.query.options(load_only(*PUBLIC_COLUMNS)).filter(
+            User.user_id.in_(user_ids)
+        ).all()
     
     def get_user_by_email(self, email: str) -> User:
         """Get user by email"""
@@ -25,10 +110,24 @@ class UserService:
         """Get user by pending email"""
         return User.query.filter_by(pending_email=email).first()
     
+    def email_in_use(self, email: str, exclude_user_id: int = None) -> bool:
+        """Check if an email is taken (as email or pending email), without loading rows"""
+        query = db.session.query(User.user_id).filter(
+            or_(User.email == email, User.pending_email == email)
+        )
+        if exclude_user_id is not None:
+            query = query.filter(User.user_id != exclude_user_id)
+        return db.session.query(query.exists()).scalar()
+    
     def create_user(self, first_name: str, last_name: str, email: str, 
                     password: str, verification_token: str = None,
                     token_expires_at: str = None) -> User:
         """Create a new user"""
+        if not (first_name and last_name and password):
+            raise ValueError('firstName, lastName and password are required')
+        if not isinstance(email, str) or not EMAIL_RE.fullmatch(email):
+            raise ValueError('Invalid email address')
+        
         user = User(
             first_name=first_name,
             last_name=last_name,
@@ -40,8 +139,14 @@ class UserService:
             email_verified=False
         )
         
+        # Single INSERT; the unique index on email detects duplicates,
+        # including races between concurrent registrations
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ConflictError('Email already exists')
         
         return user
     
@@ -49,41 +154,50 @@ class UserService:
         """Update user profile
         Returns: (User, email_changed: bool) tuple
         """
+        # Validate against the column limits before touching the database
+        updates = {}
+        for key, value in data.items():
+            attr, max_length = PROFILE_FIELDS[key]
+            if not isinstance(value, str) or len(value) > max_length:
+                raise ValueError(f'{key} must be a string of at most {max_length} characters')
+            if attr == 'email' and not EMAIL_RE.fullmatch(value):
+                raise ValueError('Invalid email address')
+            updates[attr] = value
+        
         user = self.get_user_by_id(user_id)
         
         if not user:
             return (None, False)
         
+        changed = False
         email_changed = False
+        new_email = updates.pop('email', None)
         
-        if 'firstName' in data:
-            user.first_name = data['firstName']
-        if 'lastName' in data:
-            user.last_name = data['lastName']
-        if 'email' in data:
-            new_email = data['email']
+        for attr, value in updates.items():
+            if getattr(user, attr) != value:
+                setattr(user, attr, value)
+                changed = True
+        
+        # Only a different address needs the availability check and re-verification
+        if new_email is not None and user.email != new_email:
             # Check if email is already taken by another user
-            existing_user = self.get_user_by_email(new_email)
-            if existing_user and existing_user.user_id != user_id:
-                raise ValueError('Email already in use')
-            pending_user = self.get_user_by_pending_email(new_email)
-            if pending_user and pending_user.user_id != user_id:
+            if self.email_in_use(new_email, exclude_user_id=user_id):
                 raise ValueError('Email already in use')
             
-            # If email is actually changing
-            if user.email != new_email:
-                email_changed = True
-                user.pending_email = new_email
-                # Set user to unverified and email_verified to False
-                # Only if user is not admin or super_admin
-                if user.type not in ['admin', 'super_admin']:
-                    user.type = 'unverified'
-                user.email_verified = False
-                # Clear any existing verification token so a new one is issued
-                user.verification_token = None
-                user.token_expires_at = None
-        
-        db.session.commit()
+            email_changed = True
+            user.pending_email = new_email
+            # Set user to unverified and email_verified to False
+            # Only if user is not admin or super_admin
+            if user.type not in ADMIN_TYPES:
+                user.type = 'unverified'
+            user.email_verified = False
+            # Clear any existing verification token so a new one is issued
+            user.verification_token = None
+            user.token_expires_at = None
+        
+        # Idempotent retries (same values resubmitted) skip the write entirely
+        if changed or email_changed:
+            db.session.commit()
         
         return (user, email_changed)
     
@@ -152,9 +266,9 @@ class UserService:
         # Token doesn't exist or is expired
         return (None, None)
     
-    def ban_user(self, user_id: int) -> User:
-        """Ban a user"""
-        user = self.get_user_by_id(user_id)
+    def ban_user(self, user_id: int, user: User = None) -> User:
+        """Ban a user; pass user when the caller already loaded it"""
+        user = user or self.get_user_by_id(user_id)
         
         if not user:
             return None
@@ -176,9 +290,9 @@ class UserService:
         
         return user
     
-    def promote_to_admin(self, user_id: int) -> User:
-        """Promote user to admin"""
-        user = self.get_user_by_id(user_id)
+    def promote_to_admin(self, user_id: int, user: User = None) -> User:
+        """Promote user to admin; pass user when the caller already loaded it"""
+        user = user or self.get_user_by_id(user_id)
         
         if not user:
             return None
@@ -188,9 +302,9 @@ class UserService:
         
         return user
     
-    def demote_from_admin(self, user_id: int) -> User:
-        """Demote admin to normal user"""
-        user = self.get_user_by_id(user_id)
+    def demote_from_admin(self, user_id: int, user: User = None) -> User:
+        """Demote admin to normal user; pass user when the caller already loaded it"""
+        user = user or self.get_user_by_id(user_id)
         
         if not user:
             return None
@@ -202,9 +316,9 @@ class UserService:
         
         return user
     
-    def delete_user(self, user_id: int) -> bool:
-        """Delete a user (Super Admin only)"""
-        user = self.get_user_by_id(user_id)
+    def delete_user(self, user_id: int, user: User = None) -> bool:
+        """Delete a user (Super Admin only); pass user when the caller already loaded it"""
+        user = user or self.get_user_by_id(user_id)
         
         if not user:
             return False
@@ -1,5 +1,7 @@
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, g
+from app.models.user import ADMIN_TYPES
+from app.utils.responses import error_response
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,13 +14,13 @@ def handle_exceptions(f):
         try:
             return f(*args, **kwargs)
         except ValueError as e:
-            logger.warning(f'Validation error in {f.__name__}: {str(e)}')
+            logger.warning('Validation error in %s: %s', f.__name__, e)
             return jsonify({'error': 'Validation error', 'message': str(e)}), 400
         except PermissionError as e:
-            logger.warning(f'Permission denied in {f.__name__}: {str(e)}')
+            logger.warning('Permission denied in %s: %s', f.__name__, e)
             return jsonify({'error': 'Access denied', 'message': str(e)}), 403
         except Exception as e:
-            logger.error(f'Error in {f.__name__}: {str(e)}', exc_info=True)
+            logger.error('Error in %s: %s', f.__name__, e, exc_info=True)
             return jsonify({'error': 'Internal server error', 'message': str(e)}), 500
     return decorated_function
 
@@ -28,36 +30,36 @@ def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
         user_id = request.headers.get('X-User-Id')
-        user_type = request.headers.get('X-User-Type')
         
         if not user_id:
-            return jsonify({'error': 'Authentication required'}), 401
+            return error_response('Authentication required', 401)
+        
+        # Parse the Gateway headers once for the role checks and the handler
+        g.current_user_id = user_id
+        g.current_user_type = request.headers.get('X-User-Type')
+        g.is_admin = g.current_user_type in ADMIN_TYPES
         
         return f(*args, **kwargs)
     return decorated_function
 
 
 def require_admin(f):
-    """Decorator to require admin role"""
+    """Decorator to require admin role (apply below require_auth)"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_type = request.headers.get('X-User-Type')
-        
-        if user_type not in ['admin', 'super_admin']:
-            return jsonify({'error': 'Admin access required'}), 403
+        if not g.get('is_admin'):
+            return error_response('Admin access required', 403)
         
         return f(*args, **kwargs)
     return decorated_function
 
 
 def require_super_admin(f):
-    """Decorator to require super admin role"""
+    """Decorator to require super admin role (apply below require_auth)"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        user_type = request.headers.get('X-User-Type')
-        
-        if user_type != 'super_admin':
-            return jsonify({'error': 'Super admin access required'}), 403
+        if g.get('current_user_type') != 'super_admin':
+            return error_response('Super admin access required', 403)
         
         return f(*args, **kwargs)
     return decorated_function
@@ -1,49 +1,76 @@
 from flask import jsonify
 import logging
+from app.utils.responses import error_response
 
 logger = logging.getLogger(__name__)
 
 
-class ValidationError(Exception):
+class AppError(Exception):
+    """Base class for errors that map to a JSON error response"""
+    status_code = 500
+    log_level = logging.INFO
+    
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+    
+    def to_dict(self):
+        return {'error': type(self).__name__, 'message': self.message}
+
+
+class ValidationError(AppError):
     """Custom exception for validation errors"""
+    status_code = 400
+    log_level = logging.WARNING
+    
     def __init__(self, message, details=None):
-        self.message = message
         self.details = details
-        super().__init__(self.message)
+        super().__init__(message)
+    
+    def to_dict(self):
+        data = {'error': 'Validation Error', 'message': self.message}
+        if self.details:
+            data['details'] = self.details
+        return data
 
 
-class NotFoundError(Exception):
+class NotFoundError(AppError):
     """Custom exception for resource not found"""
-    def __init__(self, message):
-        self.message = message
-        super().__init__(self.message)
+    status_code = 404
+    
+    def to_dict(self):
+        return {'error': 'Not Found', 'message': self.message}
+
+
+class ConflictError(AppError):
+    """Custom exception for conflicts with existing resources"""
+    status_code = 409
+    
+    def to_dict(self):
+        return {'error': self.message}
+
+
+def handle_app_error(error):
+    logger.log(error.log_level, '%s: %s', type(error).__name__, error.message)
+    return jsonify(error.to_dict()), error.status_code
+
+
+def handle_bad_request(error):
+    return jsonify({'error': 'Bad Request', 'message': str(error)}), 400
+
+
+def handle_not_found(error):
+    return error_response('Not Found', 404, 'The requested resource was not found')
+
+
+def handle_internal_error(error):
+    logger.error('Internal server error: %s', error)
+    return error_response('Internal Server Error', 500, 'An unexpected error occurred')
 
 
 def register_error_handlers(app):
     """Register global error handlers"""
-    
-    @app.errorhandler(ValidationError)
-    def handle_validation_error(error):
-        logger.warning(f'Validation error: {error.message}')
-        response = {'error': 'Validation Error', 'message': error.message}
-        if error.details:
-            response['details'] = error.details
-        return jsonify(response), 400
-    
-    @app.errorhandler(NotFoundError)
-    def handle_not_found_error(error):
-        logger.info(f'Not found: {error.message}')
-        return jsonify({'error': 'Not Found', 'message': error.message}), 404
-    
-    @app.errorhandler(400)
-    def handle_bad_request(error):
-        return jsonify({'error': 'Bad Request', 'message': str(error)}), 400
-    
-    @app.errorhandler(404)
-    def handle_not_found(error):
-        return jsonify({'error': 'Not Found', 'message': 'The requested resource was not found'}), 404
-    
-    @app.errorhandler(500)
-    def handle_internal_error(error):
-        logger.error(f'Internal server error: {str(error)}')
-        return jsonify({'error': 'Internal Server Error', 'message': 'An unexpected error occurred'}), 500
+    app.register_error_handler(AppError, handle_app_error)
+    app.register_error_handler(400, handle_bad_request)
+    app.register_error_handler(404, handle_not_found)
+    app.register_error_handler(500, handle_internal_error)
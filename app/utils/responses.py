@@ -0,0 +1,20 @@
+from functools import lru_cache
+import orjson
+from flask import Response
+
+
+@lru_cache(maxsize=128)
+def _error_body(error, message=None):
+    payload = {'error': error}
+    if message is not None:
+        payload['message'] = message
+    return orjson.dumps(payload)
+
+
+def error_response(error, status, message=None):
+    """Build a JSON error response for a static message.
+    The encoded body is cached per message, so only pass fixed strings
+    (never exception text). A fresh Response is returned each time since
+    after-request hooks such as CORS mutate its headers.
+    """
+    return Response(_error_body(error, message), status=status, mimetype='application/json')
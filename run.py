@@ -1,13 +1,24 @@
 import logging
+import os
 from app import create_app
 
-# Configure logging
+production = os.getenv('FLASK_ENV', 'development') == 'production'
+host = os.getenv('HOST', '0.0.0.0')
+port = int(os.getenv('PORT', 5001))
+
+# Configure logging (quieter in production, where werkzeug/waitress would
+# otherwise log a line per request)
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv('LOG_LEVEL', 'WARNING' if production else 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
 app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001, debug=True)
+    if production:
+        from waitress import serve
+        serve(app, host=host, port=port, threads=int(os.getenv('WAITRESS_THREADS', 16)))
+    else:
+        debug = os.getenv('FLASK_DEBUG', '0') == '1'
+        app.run(host=host, port=port, debug=debug)
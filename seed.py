@@ -0,0 +1,82 @@
+"""Manual database seeding script
+
+Usage:
+    python seed.py          # Add all seed users (existing emails are skipped)
+    python seed.py --clear  # Delete all users
+"""
+import argparse
+import sys
+from flask import current_app
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DatabaseError
+from app import create_app, db
+from app.models.user import User
+from app.seed_data import SEED_USERS as AUTO_SEED_USERS, SeedUser
+
+# The auto-seed users plus the ones only available through manual seeding
+SEED_USERS = AUTO_SEED_USERS + (
+    SeedUser('Bob', 'Wilson', 'bob.wilson@example.com', 'Password123!', 'unverified',
+             email_verified=False),
+    SeedUser('Banned', 'User', 'banned@example.com', 'Password123!', 'normal', active=False),
+)
+
+
+def seed_database():
+    """Insert the seed users whose email is not taken yet"""
+    # One IN (...) query instead of a lookup per seed user
+    existing_emails = set(db.session.scalars(
+        db.select(User.email).where(User.email.in_([u.email for u in SEED_USERS]))
+    ))
+
+    todo = [u for u in SEED_USERS if u.email not in existing_emails]
+    hashes = User.hash_passwords([u.password for u in todo],
+                                 rounds=current_app.config['PASSWORD_HASH_ROUNDS'])
+    rows = [u.to_row(password_hash) for u, password_hash in zip(todo, hashes)]
+
+    # A single executemany INSERT, without per-object unit-of-work bookkeeping
+    if rows:
+        db.session.execute(insert(User), rows)
+        db.session.commit()
+
+    # Report in one write rather than a print() per user
+    lines = [
+        f"  {u.email:<26} {u.type:<12} "
+        f"{'skipped (exists)' if u.email in existing_emails else 'created'}\n"
+        for u in SEED_USERS
+    ]
+    lines.append(f'Seeded {len(rows)} users, skipped {len(existing_emails)}\n')
+    sys.stdout.write(''.join(lines))
+
+
+def clear_database():
+    """Delete all users"""
+    # TRUNCATE drops and recreates the table instead of deleting row by row,
+    # and resets AUTO_INCREMENT; fall back to DELETE where it is rejected
+    # (foreign keys referencing users, or databases without TRUNCATE)
+    try:
+        db.session.execute(text(f'TRUNCATE TABLE {User.__tablename__}'))
+        db.session.commit()
+        print('Cleared all users')
+    except DatabaseError:
+        db.session.rollback()
+        deleted = db.session.query(User).delete()
+        db.session.commit()
+        print(f'Deleted {deleted} users')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the user database with test users')
+    parser.add_argument('--clear', action='store_true', help='delete all users instead of seeding')
+    args = parser.parse_args()
+
+    # seed.py decides what to insert itself, so skip the startup auto-seed
+    app = create_app(auto_seed=False)
+    with app.app_context():
+        if args.clear:
+            clear_database()
+        else:
+            seed_database()
+
+
+if __name__ == '__main__':
+    main()